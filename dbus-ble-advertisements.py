@@ -36,6 +36,10 @@ Requires BlueZ >= 5.56 with --experimental enabled and Linux kernel >= 5.10.
 """
 
 import asyncio
+import collections
+import functools
+import hashlib
+import json
 import re
 import sys
 import threading
@@ -43,22 +47,74 @@ import time
 import logging
 import signal
 import os
+import xml.etree.ElementTree as ET
 from typing import Dict, Set, Tuple, Optional
 
 sys.path.insert(1, os.path.join(os.path.dirname(__file__), 'ext', 'bleak'))
 from bleak import BleakScanner
 from bleak.assigned_numbers import AdvertisementDataType
 
+sys.path.insert(1, os.path.join(os.path.dirname(__file__), 'ext', 'velib_python'))
+from vedbus import VeDbusService
+from settingsdevice import SettingsDevice
+
 import dbus
+import dbus.lowlevel
 import dbus.service
 from dbus.mainloop.glib import DBusGMainLoop
 from gi.repository import GLib
 
 DEFAULT_REPEAT_INTERVAL = 600  # 10 minutes - default for deduplication of identical packets
+DEVICE_CACHE_MAX = 8192  # Bound on the runtime device cache (LRU-evicted)
+DEVICE_NAMES_MAX = 4096  # Bound on the MAC -> name cache (LRU-evicted)
+ROUTE_CACHE_MAX = 4096  # Bound on the (mfg, pid) route cache (cleared when full)
+# Per-service registration cache, written to tmpfs so a service restart can
+# skip re-scanning peers whose bus owner hasn't changed since we last looked.
+REGISTRATION_CACHE = '/run/dbus-ble-advertisements/registrations.json'
 DEFAULT_LOG_INTERVAL = 3000  # 50 minutes - default (max) for logging routing activity per device
 # Device enabled states are stored in D-Bus settings at:
 # /Settings/Devices/ble_advertisements/Device_{mac_sanitized}/Enabled
 
+# Registration path patterns, precompiled once at module load. _parse_registrations
+# runs against every introspected path of every client service; the cheap substring
+# dispatch there picks which of these to run so at most one regex executes per path.
+_RE_MFGR_PRODUCT_RANGE = re.compile(r'/mfgr_product_range/(\d+)_(\d+)_(\d+)$')
+_RE_MFGR_PRODUCT = re.compile(r'/mfgr_product/(\d+)_(\d+)$')
+_RE_MFGR = re.compile(r'/mfgr/(\d+)$')
+
+# Relay switch state path, e.g. /SwitchableOutput/relay_efc1119da391/State
+_RE_RELAY_STATE = re.compile(r'^/SwitchableOutput/relay_([^/]+)/State$')
+
+# Child <node name="..."/> entries in D-Bus introspection XML. The walk in
+# _parse_registrations only needs the node names, so a targeted scan beats
+# building a full ElementTree for every introspected path.
+_RE_NODE_NAME = re.compile(r'<node\s+name=(["\'])([^"\']+)\1')
+
+# Root logger, resolved once - the routing hot path consults it per packet
+# and logging.getLogger() takes a lock on every call.
+_ROOT_LOGGER = logging.getLogger()
+
+
+@functools.lru_cache(maxsize=4096)
+def _mac_to_relay_id(mac: str) -> str:
+    """MAC address to relay identifier, e.g. "EF:C1:11:9D:A3:91" -> "efc1119da391".
+
+    Derived on every routed advertisement, so memoized - the same handful of
+    MACs repeat thousands of times a minute on a live site.
+    """
+    return mac.replace(':', '').lower()
+
+
+def _payload_digest(data: bytes) -> bytes:
+    """8-byte digest of an advertisement payload for dedup comparisons.
+
+    Storing a fixed-size digest instead of the raw payload keeps the device
+    cache small on crowded RF sites and makes the unchanged-heartbeat
+    comparison O(1) regardless of payload length.
+    """
+    return hashlib.blake2b(data, digest_size=8).digest()
+
+
 PASSIVE_SCAN_OR_PATTERNS = [
     (0, AdvertisementDataType.FLAGS, bytes([0x02])),
     (0, AdvertisementDataType.FLAGS, bytes([0x04])),
@@ -88,6 +144,17 @@ class AdvertisementEmitter(dbus.service.Object):
         """
         pass
 
+    @dbus.service.signal(dbus_interface='com.victronenergy.switch.ble_advertisements',
+                         signature='a(sqaynss)')
+    def Advertisements(self, advertisements):
+        """Signal carrying several coalesced advertisements in one message
+
+        Emitted instead of multiple Advertisement signals when more than one
+        device matched this path within the same flush interval. Each struct
+        holds the same fields, in the same order, as the Advertisement signal.
+        """
+        pass
+
 
 class RootObject(dbus.service.Object):
     """Root D-Bus object to provide service presence and introspection"""
@@ -136,7 +203,9 @@ class SettingsObject(dbus.service.Object):
                          in_signature='', out_signature='v')
     def GetValue(self):
         """Return current value"""
-        logging.info(f"GetValue called on {self._path}, returning: {self._value}")
+        # The GUI polls this - lazy %-formatting at DEBUG keeps the read
+        # path free of string building at the default log level
+        logging.debug("GetValue called on %s, returning: %s", self._path, self._value)
         return self._value
     
     @dbus.service.method(dbus_interface='com.victronenergy.BusItem',
@@ -145,7 +214,7 @@ class SettingsObject(dbus.service.Object):
         """Set value - returns 0 on success"""
         old_value = self._value
         self._value = int(value)
-        logging.info(f"SetValue called on {self._path}, changed from {old_value} to {self._value}")
+        logging.info("SetValue called on %s, changed from %s to %s", self._path, old_value, self._value)
         self.PropertiesChanged({'Value': self._value})
         return 0
     
@@ -153,7 +222,7 @@ class SettingsObject(dbus.service.Object):
                          in_signature='', out_signature='s')
     def GetText(self):
         """Return text representation"""
-        logging.info(f"GetText called on {self._path}, returning: {str(self._value)}")
+        logging.debug("GetText called on %s, returning: %s", self._path, self._value)
         return str(self._value)
     
     @dbus.service.signal(dbus_interface='com.victronenergy.BusItem',
@@ -192,8 +261,10 @@ class UIDevice(dbus.service.Object):
             # The bus name is owned by dbus-ble-sensors
             proxy = bus.get_object('org.freedesktop.DBus', '/org/freedesktop/DBus')
             dbus_iface = dbus.Interface(proxy, 'org.freedesktop.DBus')
-            
-            if 'com.victronenergy.ble' not in dbus_iface.ListNames():
+
+            # NameHasOwner is a single membership check; ListNames would
+            # transfer the entire bus name list per UIDevice constructed
+            if not dbus_iface.NameHasOwner('com.victronenergy.ble'):
                 logging.error("com.victronenergy.ble service not found - cannot publish UI devices")
                 raise RuntimeError("com.victronenergy.ble service not available")
             
@@ -224,7 +295,15 @@ class BLEAdvertisementRouter:
     
     def __init__(self, bus):
         self.bus = bus
-        
+
+        # Private second connection used only for scanning other services for
+        # registration paths. Introspect/GetManagedObjects traffic shares no
+        # state with signal emission, and giving it its own connection keeps
+        # a slow peer (or an introspect storm at startup) from queueing
+        # behind - or starving - the advertisement path on the service-owning
+        # connection.
+        self.intro_bus = dbus.SystemBus(private=True)
+
         # Migrate settings from old service name if needed
         self._migrate_settings()
         
@@ -234,11 +313,6 @@ class BLEAdvertisementRouter:
         # Create root object to provide GetVersion, GetStatus, GetHeartbeat methods
         self.root_obj = RootObject(self.bus_name)
         
-        # Import VeDbusService for creating a proper Venus OS device
-        sys.path.insert(1, os.path.join(os.path.dirname(__file__), 'ext', 'velib_python'))
-        from vedbus import VeDbusService
-        from settingsdevice import SettingsDevice
-        
         # Create as a device with switchable outputs so it appears in the device list
         self.dbusservice = VeDbusService('com.victronenergy.switch.ble_advertisements', bus, register=False)
         
@@ -340,10 +414,13 @@ class BLEAdvertisementRouter:
         # Key: MAC without colons (e.g., "efc1119da391")
         # Value: dict with:
         #   - route: bool (enabled for routing)
-        #   - previous: bytes (last routed payload, only if route=True)
+        #   - previous: bytes (8-byte digest of last routed payload, only if route=True)
         #   - timestamp: float (last route time, only if route=True)
         #   - last_log_time: float (last time we logged routing for this device)
-        self.discovered_devices: Dict[str, dict] = {}
+        # Bounded LRU (DEVICE_CACHE_MAX entries): insertion order doubles as
+        # recency order, _cache_device evicts the oldest entry past capacity.
+        # Evicted devices are rebuilt from their D-Bus switch on next sight.
+        self.discovered_devices: collections.OrderedDict = collections.OrderedDict()
         
         # Repeat interval in seconds (cached from slider for fast access)
         self._repeat_interval: int = DEFAULT_REPEAT_INTERVAL
@@ -353,6 +430,11 @@ class BLEAdvertisementRouter:
         
         # Whether routing logging is enabled (controlled by log interval toggle)
         self._log_enabled: bool = True
+
+        # Discovery toggle state, cached as a plain bool so the per-packet
+        # path doesn't go through a VeDbusService item lookup. Kept in sync
+        # by _on_discovery_changed and the settings restore below.
+        self._discovery_enabled: bool = False
         
         # Register device in settings (for GUI device list) - DO THIS BEFORE REGISTERING SERVICE
         settings = {
@@ -406,6 +488,7 @@ class BLEAdvertisementRouter:
         # Now restore discovery state from settings AFTER registering
         discovery_state = self._settings['DiscoveryEnabled']
         self.dbusservice['/SwitchableOutput/relay_discovery/State'] = discovery_state
+        self._discovery_enabled = bool(discovery_state)
         # Do not change Status here – leave it at 0 (OK) to match other
         # simple switch implementations. Only State reflects on/off.
         if discovery_state:
@@ -470,18 +553,104 @@ class BLEAdvertisementRouter:
         # Signal emitters for each registered path
         # Key: full path (e.g., '/ble_advertisements/orion_tr/mfgr/737'), Value: AdvertisementEmitter
         self.emitters: Dict[str, AdvertisementEmitter] = {}
-        
+
+        # Advertisement payloads waiting for the next coalesced flush.
+        # Key: registration path, Value: dict of MAC -> latest dbus-typed payload
+        # tuple. Keying the inner dict by MAC coalesces repeats from the same
+        # device while never dropping a different device that shares the path
+        # (e.g. two devices matching the same manufacturer registration).
+        self._pending_emits: Dict[str, dict] = {}
+
+        # Registered paths we've already warned about having no emitter
+        self._missing_emitter_logged: Set[str] = set()
+
+        # Frozenset snapshots of the registration keys, rebuilt whenever
+        # registrations change. should_process_advertisement tests these
+        # before any other per-packet work, so the >95% of RF traffic that
+        # matches nothing costs two containment checks
+        self._mfg_keys: frozenset = frozenset()
+        self._mac_keys: frozenset = frozenset()
+
+        # Memoized routing: (mfg_id, product_id) -> frozenset of registration
+        # paths, baking the mfgr-only, exact-pid and pid-range matches into a
+        # single lookup. Built lazily on first sight of each key and cleared
+        # whenever registrations change; MAC registrations stay separate since
+        # they don't key on the payload. Bounded (ROUTE_CACHE_MAX) because the
+        # product id is two payload-controlled bytes - a beacon spoofing a
+        # registered mfg id while cycling them would otherwise grow this
+        # without limit.
+        self._route_cache: Dict[Tuple[int, Optional[int]], frozenset] = {}
+
+
         # Device name tracking
         # Key: MAC address, Value: device name (or empty string if unknown)
-        self.device_names: Dict[str, str] = {}
+        # Bounded LRU (DEVICE_NAMES_MAX entries) - random MACs near a busy RF
+        # site would otherwise grow this without limit. Only mutated on the
+        # GLib main loop (scanner-thread name updates arrive via _adv_queue).
+        self.device_names: collections.OrderedDict = collections.OrderedDict()
         
         # Passive scanner state
         self._scanner_thread = None
         self._scanner_loop = None
         self._scanner_stop = threading.Event()
+
+        # Advertisements queued from the scanner thread, drained in batches on
+        # the GLib main loop. One idle callback drains many advertisements
+        # instead of scheduling one callback per advertisement, which keeps
+        # main loop wakeups (and their interleaving with D-Bus dispatch) low
+        # during btmon-style advertisement bursts. Bounded so a stalled main
+        # loop drops the oldest packets rather than growing without limit.
+        self._adv_queue = collections.deque(maxlen=10000)
+        self._adv_drain_scheduled = False
         
         # Pending services for asynchronous registration scan
         self._pending_scan_services: list[str] = []
+
+        # Debounce flag for slider-driven device cache clears
+        self._cache_clear_pending = False
+
+        # Discovered-device relays (not the discovery or slider controls),
+        # maintained at switch create/delete time so the discovery toggle
+        # doesn't have to filter every exported D-Bus path. Keyed by relay id,
+        # value is the precomputed (ShowUIControl, Name) path pair so the
+        # toggle loop does no string splitting or formatting.
+        self._relay_controls: Dict[str, Tuple[str, str]] = {}
+
+        # Unique bus owner per scanned service, used to validate the on-disk
+        # registration cache across our own restarts
+        self._service_owners: Dict[str, str] = {}
+
+        # Services whose registration scan ran to completion. Owners are
+        # recorded before their scan finishes, so the cache writer only
+        # persists services carrying this mark - a partial or timed-out scan
+        # written to disk would be replayed after a restart as the full
+        # registration set and never re-scanned while the peer keeps its
+        # bus owner.
+        self._scan_completed: Set[str] = set()
+
+        # Recursive-walk accounting: outstanding child Introspect calls per
+        # service, and services whose walk lost a subtree to an error or
+        # timeout. A walk is complete only when its counter drains to zero
+        # with no recorded error.
+        self._pending_introspects: Dict[str, int] = {}
+        self._walk_errors: Set[str] = set()
+
+        # Services that appeared on the bus but haven't been scanned yet -
+        # NameOwnerChanged arrives in bursts during system boot, so appearances
+        # are coalesced behind a single short timer instead of kicking off one
+        # registration scan per signal
+        self._appeared_services: Set[str] = set()
+        self._appeared_drain_scheduled = False
+
+        # Debounce flag for registration cache writes - set while a write is
+        # scheduled so bursts of registration changes (e.g. an introspection
+        # walk landing one leaf per reply) produce a single file rewrite
+        self._reg_cache_save_pending = False
+
+        # Reverse index: service name -> registration paths it owns. Lets a
+        # disappearing service be cleaned up in O(its paths) instead of
+        # substring-scanning every path in every registration map.
+        self._paths_by_service: Dict[str, Set[str]] = {}
         
         # Do initial full scan for registrations AFTER main loop starts (non-blocking)
         # DISABLED: We don't need to scan! Just emit to paths when we get matching advertisements.
@@ -489,32 +658,66 @@ class BLEAdvertisementRouter:
         # We'll emit signals to ALL possible paths for a given advertisement and let D-Bus handle delivery.
         logging.info("Router ready - will emit signals to matching registration paths as advertisements arrive")
         
-        # Subscribe to D-Bus NameOwnerChanged signals to detect when services appear/disappear
-        self.bus.add_signal_receiver(
-            self._on_name_owner_changed,
-            signal_name='NameOwnerChanged',
-            dbus_interface='org.freedesktop.DBus',
-            path='/org/freedesktop/DBus'
+        # Subscribe to D-Bus NameOwnerChanged signals to detect when services
+        # appear/disappear. The arg0namespace match makes dbus-daemon drop
+        # name changes outside com.victronenergy.* before they ever reach this
+        # process - a plain add_signal_receiver would wake us for every name
+        # change on the bus (dozens/sec on a busy Venus system). That rule
+        # isn't expressible through add_signal_receiver, so pair an explicit
+        # match string with a message filter.
+        self.bus.add_match_string(
+            "type='signal',sender='org.freedesktop.DBus',"
+            "interface='org.freedesktop.DBus',member='NameOwnerChanged',"
+            "arg0namespace='com.victronenergy'"
+        )
+        self.bus.add_message_filter(self._name_owner_filter)
+
+        # Track registration paths that clients add or remove while running.
+        # Without these, a client publishing a new registration object after
+        # its initial scan would only be noticed on its next restart.
+        # arg0path makes dbus-daemon drop ObjectManager signals for objects
+        # outside /ble_advertisements/ before they reach this process -
+        # without it every BlueZ device (dis)appearance would be demarshalled
+        # here just to be discarded by the handler's path check.
+        self.bus.add_match_string(
+            "type='signal',interface='org.freedesktop.DBus.ObjectManager',"
+            "member='InterfacesAdded',arg0path='/ble_advertisements/'"
+        )
+        self.bus.add_match_string(
+            "type='signal',interface='org.freedesktop.DBus.ObjectManager',"
+            "member='InterfacesRemoved',arg0path='/ble_advertisements/'"
         )
         
-        # Update heartbeat every 10 minutes
-        GLib.timeout_add_seconds(600, self._update_heartbeat)
+        # Flush coalesced advertisement signals every 200ms. Batching the
+        # emissions cuts dbus-daemon round-trips, which dominate CPU cost on
+        # slow targets like the CCGX when many paths match per advertisement.
+        GLib.timeout_add(200, self._flush_emits)
     
     def _migrate_settings(self):
         """Migrate settings from old service name to new name"""
         old_paths = [
             "/Settings/Devices/ble_router/ClassAndVrmInstance",
             "/Settings/Devices/ble_router/DiscoveryEnabled",
-            "/Settings/Devices/ble_advertisements/ClassAndVrmInstance",
-            "/Settings/Devices/ble_advertisements/DiscoveryEnabled",
         ]
         new_paths = [
             "/Settings/Devices/ble_advertisements/ClassAndVrmInstance",
             "/Settings/Devices/ble_advertisements/DiscoveryEnabled",
-            "/Settings/Devices/ble_advertisements/ClassAndVrmInstance",
-            "/Settings/Devices/ble_advertisements/DiscoveryEnabled",
         ]
-        
+
+        # One probe of the legacy parent decides whether any migration is
+        # needed - the common case (fresh install or already migrated) then
+        # costs a single round-trip instead of one blocking GetValue per path
+        try:
+            legacy_obj = self.bus.get_object('com.victronenergy.settings',
+                                             '/Settings/Devices/ble_router')
+            dbus.Interface(legacy_obj, 'org.freedesktop.DBus.Introspectable').Introspect()
+        except dbus.exceptions.DBusException:
+            logging.debug("No legacy ble_router settings to migrate")
+            return
+        except Exception as e:
+            logging.warning(f"Error probing legacy settings: {e}")
+            return
+
         for old_path, new_path in zip(old_paths, new_paths):
             try:
                 # Check if old settings exist
@@ -556,7 +759,6 @@ class BLEAdvertisementRouter:
             xml_data = introspect_iface.Introspect()
             
             # Parse XML to find Device_* entries
-            import xml.etree.ElementTree as ET
             root = ET.fromstring(xml_data)
             
             restored_count = 0
@@ -668,25 +870,66 @@ class BLEAdvertisementRouter:
             ctx.add_path(f'{output_path}/Settings/Group', '', writeable=True)
             ctx.add_path(f'{output_path}/Settings/ShowUIControl', 1, writeable=True)
             ctx.add_path(f'{output_path}/Settings/PowerOnState', 1)
-        
+
+        self._track_relay_switch(relay_id)
+
         # Add to runtime cache
-        self.discovered_devices[relay_id] = {
+        self._cache_device(relay_id, {
             'route': enabled,
             'previous': None,
             'timestamp': 0.0,
             'last_log_time': 0.0
-        }
+        })
         
         logging.debug(f"Created switch for device {name} ({relay_id}), enabled={enabled}")
     
+    def _track_relay_switch(self, relay_id: str):
+        """Record a device relay and its derived UI paths for the discovery toggle."""
+        output_path = f'/SwitchableOutput/relay_{relay_id}'
+        self._relay_controls[relay_id] = (f'{output_path}/Settings/ShowUIControl',
+                                          f'{output_path}/Name')
+
+    def _cache_device(self, relay_id: str, entry: dict):
+        """Insert or refresh a device cache entry, evicting the oldest past capacity."""
+        self.discovered_devices[relay_id] = entry
+        self.discovered_devices.move_to_end(relay_id)
+        while len(self.discovered_devices) > DEVICE_CACHE_MAX:
+            self.discovered_devices.popitem(last=False)
+
+    def _request_cache_clear(self):
+        """Debounced device-cache clear for the slider callbacks.
+
+        Dragging a slider fires its change callback on every GUI step, and
+        clearing per step wipes the dedup state repeatedly, triggering a
+        burst of re-emits. Coalesce behind one short timer so a drag clears
+        the cache once after the user settles.
+        """
+        if self._cache_clear_pending:
+            return
+        self._cache_clear_pending = True
+        GLib.timeout_add(250, self._do_cache_clear)
+
+    def _do_cache_clear(self):
+        self._cache_clear_pending = False
+        self.discovered_devices.clear()
+        logging.debug("Cleared device cache (settings changed)")
+        return False
+
+    def _set_device_name(self, mac: str, name: str):
+        """Record a device name, evicting the least-recently-heard past capacity."""
+        self.device_names[mac] = name
+        self.device_names.move_to_end(mac)
+        while len(self.device_names) > DEVICE_NAMES_MAX:
+            self.device_names.popitem(last=False)
+
     def _on_relay_state_changed(self, path: str, value: int):
         """Callback when a discovered device relay state changes."""
         # Extract relay_id from path like "/SwitchableOutput/relay_efc1119da391/State"
-        path_parts = path.split('/')
-        if len(path_parts) < 3 or not path_parts[2].startswith('relay_'):
+        match = _RE_RELAY_STATE.match(path)
+        if not match:
             return True
-        
-        relay_id = path_parts[2].replace('relay_', '')
+
+        relay_id = match.group(1)
         enabled = (value == 1)
         
         # Update the cache entry instead of clearing everything
@@ -694,12 +937,12 @@ class BLEAdvertisementRouter:
             self.discovered_devices[relay_id]['route'] = enabled
         else:
             # Create cache entry if it doesn't exist
-            self.discovered_devices[relay_id] = {
+            self._cache_device(relay_id, {
                 'route': enabled,
                 'previous': None,
                 'timestamp': 0.0,
                 'last_log_time': 0.0
-            }
+            })
         
         # Status is always 0 (OK) - State indicates on/off
         self.dbusservice[f'/SwitchableOutput/relay_{relay_id}/Status'] = 0
@@ -738,10 +981,9 @@ class BLEAdvertisementRouter:
         
         logging.info(f"Repeat interval changed to {new_interval} seconds (slider={slider_value})")
         
-        # Clear the cache so all devices get fresh timestamps
-        self.discovered_devices.clear()
-        logging.debug("Cleared device cache (repeat interval changed)")
-        
+        # Clear the cache (debounced) so all devices get fresh timestamps
+        self._request_cache_clear()
+
         return True
     
     def _on_log_interval_changed(self, path, value):
@@ -761,10 +1003,9 @@ class BLEAdvertisementRouter:
         self.dbusservice['/SwitchableOutput/relay_log_interval/Name'] = f'* Logging frequency when routing: {new_interval}s'
         self.dbusservice['/SwitchableOutput/relay_log_interval/Measurement'] = new_interval
         
-        # Clear the cache so all devices get fresh log timestamps
-        self.discovered_devices.clear()
-        logging.debug("Cleared device cache (log interval changed)")
-        
+        # Clear the cache (debounced) so all devices get fresh log timestamps
+        self._request_cache_clear()
+
         logging.info(f"Log interval changed to {new_interval} seconds (slider={slider_value})")
         return True
     
@@ -822,6 +1063,7 @@ class BLEAdvertisementRouter:
         """Callback when new device discovery toggle (SwitchableOutput/relay_discovery/State) changes"""
         # Handle both string and integer values from D-Bus
         enabled = (int(value) == 1) if isinstance(value, (int, str)) else bool(value)
+        self._discovery_enabled = enabled
         logging.info(f"New device discovery changed to: {enabled}")
         
         # Clear the cache on any discovery toggle - it will repopulate naturally
@@ -836,50 +1078,30 @@ class BLEAdvertisementRouter:
         # to indicate an "active" state, but using 0x09 here is not required
         # for GUI visibility and may in fact prevent the card from showing.
         
-        # Iterate over actual D-Bus paths (source of truth), not the dictionary cache
-        # Find all relay State paths
-        relay_paths = [p for p in self.dbusservice._dbusobjects.keys() 
-                       if p.startswith('/SwitchableOutput/relay_') and p.endswith('/State')
-                       and 'relay_discovery' not in p]
-        
+        # Group every visibility write into one ItemsChanged message - an
+        # individual PropertiesChanged per relay makes dbus-daemon and the
+        # GUI reprocess the switches pane N times per toggle
+        show = 1 if enabled else 0
         if enabled:
-            # Discovery enabled: show all device toggles and settings sliders
             logging.info("Discovery enabled - showing all device switches")
-            
-            # Show repeat interval and log interval sliders
-            self.dbusservice['/SwitchableOutput/relay_repeat_interval/Settings/ShowUIControl'] = 1
-            self.dbusservice['/SwitchableOutput/relay_log_interval/Settings/ShowUIControl'] = 1
-            
-            for state_path in relay_paths:
-                relay_part = state_path.split('/')[2]  # e.g., "relay_efc1119da391"
-                output_path = f'/SwitchableOutput/{relay_part}'
-                show_path = f'{output_path}/Settings/ShowUIControl'
-                name_path = f'{output_path}/Name'
-                
-                if show_path in self.dbusservice:
-                    self.dbusservice[show_path] = 1
-                    name = self.dbusservice[name_path] if name_path in self.dbusservice else relay_part
-                    logging.info(f"Made {name} visible in switches pane")
         else:
-            # Discovery disabled: hide ALL device switches and settings sliders
             logging.info("Discovery disabled - hiding all device switches")
-            
-            # Hide repeat interval and log interval sliders
-            self.dbusservice['/SwitchableOutput/relay_repeat_interval/Settings/ShowUIControl'] = 0
-            self.dbusservice['/SwitchableOutput/relay_log_interval/Settings/ShowUIControl'] = 0
-            
-            for state_path in relay_paths:
-                relay_part = state_path.split('/')[2]  # e.g., "relay_efc1119da391"
-                output_path = f'/SwitchableOutput/{relay_part}'
-                name_path = f'{output_path}/Name'
-                show_path = f'{output_path}/Settings/ShowUIControl'
-                name = self.dbusservice[name_path] if name_path in self.dbusservice else relay_part
-                
-                # Hide the switch but keep it (preserves enabled/disabled state)
-                if show_path in self.dbusservice:
-                    self.dbusservice[show_path] = 0
-                    logging.info(f"Hidden device {name} from switches pane")
-        
+
+        with self.dbusservice as ctx:
+            # Repeat interval and log interval sliders follow the toggle
+            ctx['/SwitchableOutput/relay_repeat_interval/Settings/ShowUIControl'] = show
+            ctx['/SwitchableOutput/relay_log_interval/Settings/ShowUIControl'] = show
+
+            # UI paths are precomputed per relay at switch-creation time, so
+            # the loop does no splitting or string formatting
+            for relay_id, (show_path, name_path) in self._relay_controls.items():
+                # Hiding keeps the switch around, preserving its enabled state
+                if show_path in ctx:
+                    ctx[show_path] = show
+                    name = ctx[name_path] if name_path in ctx else relay_id
+                    logging.info(f"{'Made' if enabled else 'Hidden'} device {name} "
+                                 f"{'visible in' if enabled else 'from'} switches pane")
+
         return True  # Accept the change
     
     
@@ -889,29 +1111,31 @@ class BLEAdvertisementRouter:
         Only updates if discovery mode is enabled - no need to update names when not discovering.
         """
         # Skip if discovery is disabled - no need to update UI elements
-        discovery_enabled = self.dbusservice['/SwitchableOutput/relay_discovery/State'] == 1
-        if not discovery_enabled:
+        if not self._discovery_enabled:
             return
         
-        relay_id = mac.replace(':', '').lower()
+        relay_id = _mac_to_relay_id(mac)
         name_path = f'/SwitchableOutput/relay_{relay_id}/Name'
         
         # Only update if the switch exists on D-Bus
         if name_path in self.dbusservice:
             new_name = f"{name} ({mac})"
             self.dbusservice[name_path] = new_name
-            logging.debug(f"Updated device name: {new_name}")
+            logging.debug("Updated device name: %s", new_name)
     
     def _get_service_names_for_mac(self, mac: str) -> list:
         """Get list of service names that are registered for this MAC address"""
         services = set()
         if mac in self.mac_registrations:
+            prefix = '/ble_advertisements/'
             for path in self.mac_registrations[mac]:
-                # Path format: /ble_advertisements/{service_name}/addr/{mac}
-                parts = path.split('/')
-                if len(parts) >= 3:
-                    service_name = parts[2]  # Extract service name
-                    services.add(service_name)
+                # Path format: /ble_advertisements/{service_name}/addr/{mac} -
+                # slice the service name out instead of splitting the whole
+                # path into a list
+                if path.startswith(prefix):
+                    end = path.find('/', len(prefix))
+                    if end > 0:
+                        services.add(path[len(prefix):end])
         return sorted(list(services))
     
     def _add_discovered_device(self, mac: str, name: str):
@@ -928,12 +1152,11 @@ class BLEAdvertisementRouter:
         Uses context manager to emit ItemsChanged signal so GUI picks up new switches.
         """
         # MAC without colons as relay identifier
-        relay_id = mac.replace(':', '').lower()  # e.g., "efc1119da391"
+        relay_id = _mac_to_relay_id(mac)  # e.g., "efc1119da391"
         output_path = f'/SwitchableOutput/relay_{relay_id}'
         
         # Only add if discovery is enabled and device doesn't already exist
-        discovery_enabled = self.dbusservice['/SwitchableOutput/relay_discovery/State']
-        if discovery_enabled == 0:
+        if not self._discovery_enabled:
             return
         
         # Check cache first (fast), then D-Bus (authoritative)
@@ -941,13 +1164,14 @@ class BLEAdvertisementRouter:
             return
         if f'{output_path}/State' in self.dbusservice:
             # Switch exists on D-Bus but not in cache - add to cache
+            self._track_relay_switch(relay_id)
             state = self.dbusservice[f'{output_path}/State']
-            self.discovered_devices[relay_id] = {
+            self._cache_device(relay_id, {
                 'route': (state == 1),
                 'previous': None,
                 'timestamp': 0.0,
                 'last_log_time': 0.0
-            }
+            })
             return
         
         # Create new D-Bus paths for this device - enabled by default
@@ -967,18 +1191,17 @@ class BLEAdvertisementRouter:
             ctx.add_path(f'{output_path}/Settings/Group', '', writeable=True)
             ctx.add_path(f'{output_path}/Settings/ShowUIControl', 1, writeable=True)
             ctx.add_path(f'{output_path}/Settings/PowerOnState', 1)
-        
-        # Track in runtime cache (enabled by default, no previous payload yet)
-        # Safety valve: clear cache if it grows too large
-        if len(self.discovered_devices) > 1000:
-            self.discovered_devices.clear()
-            logging.warning("Cleared device cache (exceeded 1000 entries)")
-        self.discovered_devices[relay_id] = {
+
+        self._track_relay_switch(relay_id)
+
+        # Track in runtime cache (enabled by default, no previous payload yet).
+        # _cache_device evicts the oldest entry if we're over capacity.
+        self._cache_device(relay_id, {
             'route': True,
             'previous': None,
             'timestamp': 0.0,
             'last_log_time': 0.0
-        }
+        })
         
         # Persist to settings so device survives reboot
         self._save_device_to_settings(relay_id, name, True)
@@ -995,7 +1218,8 @@ class BLEAdvertisementRouter:
             relay_id: MAC without colons (e.g., "efc1119da391")
         """
         output_path = f'/SwitchableOutput/relay_{relay_id}'
-        
+        self._relay_controls.pop(relay_id, None)
+
         # Use context manager to emit ItemsChanged signal when done
         with self.dbusservice as ctx:
             ctx.del_tree(output_path)
@@ -1022,19 +1246,52 @@ class BLEAdvertisementRouter:
         GLib.idle_add.
         """
         try:
-            bus_obj = self.bus.get_object('org.freedesktop.DBus', '/')
+            bus_obj = self.intro_bus.get_object('org.freedesktop.DBus', '/')
             bus_iface = dbus.Interface(bus_obj, 'org.freedesktop.DBus')
             service_names = bus_iface.ListNames()
             
             # Scan all com.victronenergy.* services (skip system services, unique names, and ourselves)
             # Using async introspection so slow services won't block the mainloop
-            self._pending_scan_services = [
+            candidates = [
                 s for s in service_names
                 if isinstance(s, str)
                 and s.startswith('com.victronenergy.')
                 and not s.startswith(':')
                 and s != 'com.victronenergy.switch.ble_advertisements'  # Skip ourselves
             ]
+
+            # Replay cached registrations for services whose unique bus owner
+            # is unchanged since the last run - those don't need re-scanning.
+            # GetNameOwner is answered by dbus-daemon itself, so these lookups
+            # don't depend on slow peers.
+            cache = self._load_registration_cache()
+            restored_any = False
+            self._pending_scan_services = []
+            for s in candidates:
+                try:
+                    owner = str(bus_iface.GetNameOwner(s))
+                except dbus.exceptions.DBusException:
+                    continue  # Disappeared between ListNames and now
+                self._service_owners[s] = owner
+                entry = cache.get(s)
+                if entry and entry.get('owner') == owner:
+                    restored = 0
+                    for path in entry.get('paths', []):
+                        if self._register_path(s, str(path)):
+                            restored += 1
+                    if restored:
+                        logging.info(f"Restored {restored} cached registration(s) for {s}")
+                        restored_any = True
+                    # Cache hit - skip the live scan. Entries are safe to
+                    # trust (even empty ones): the writer only persists
+                    # scans that ran to completion. The replayed set counts
+                    # as completed again so the next cache write keeps it.
+                    self._scan_completed.add(s)
+                    continue
+                self._pending_scan_services.append(s)
+            if restored_any:
+                self._update_emitters()
+
             logging.info(
                 f"Queued {len(self._pending_scan_services)} services for async registration scan"
             )
@@ -1081,12 +1338,81 @@ class BLEAdvertisementRouter:
         
         return False  # Don't reschedule automatically
     
-    def _update_heartbeat(self):
-        """Periodic callback to update heartbeat timestamp"""
-        # TODO: Re-implement heartbeat for advertisement service monitoring
-        logging.debug("Heartbeat updated")
-        return True  # Keep the timer running
-    
+    def _service_for_owner(self, owner):
+        """Map a unique bus name back to the well-known service that owns it."""
+        for service_name, service_owner in self._service_owners.items():
+            if service_owner == owner:
+                return service_name
+        return None
+
+    def _on_interfaces_added(self, object_path, interfaces, sender=None):
+        """ObjectManager InterfacesAdded handler - pick up new registrations live."""
+        path = str(object_path)
+        if '/ble_advertisements/' not in path:
+            return
+        service_name = self._service_for_owner(str(sender)) if sender else None
+        if not service_name:
+            return
+        if self._register_path(service_name, path):
+            self._update_emitters()
+            self.discovered_devices.clear()
+            logging.debug("Cleared device cache (new registration)")
+
+    def _on_interfaces_removed(self, object_path, interfaces, sender=None):
+        """ObjectManager InterfacesRemoved handler - drop registrations live."""
+        path = str(object_path)
+        if '/ble_advertisements/' not in path:
+            return
+        self._unregister_path(path)
+
+    def _unregister_path(self, path):
+        """Remove a single registration path from all maps and its emitter."""
+        removed = False
+        for registrations in (self.mfg_registrations, self.mac_registrations,
+                              self.pid_registrations, self.pid_range_registrations):
+            for key, paths in list(registrations.items()):
+                if path in paths:
+                    paths.discard(path)
+                    removed = True
+                    if not paths:
+                        del registrations[key]
+        for paths in self._paths_by_service.values():
+            paths.discard(path)
+        if removed:
+            logging.info(f"Registration removed: {path}")
+            self._update_emitters()
+            self.discovered_devices.clear()
+            logging.debug("Cleared device cache (registration removed)")
+
+    def _name_owner_filter(self, bus, message):
+        """Message filter dispatching the narrowed add_match_string matches.
+
+        Handles NameOwnerChanged plus the ObjectManager signals scoped to
+        /ble_advertisements/ by their arg0path match rules.
+        """
+        interface = message.get_interface()
+        if (interface == 'org.freedesktop.DBus'
+                and message.get_member() == 'NameOwnerChanged'):
+            try:
+                name, old_owner, new_owner = message.get_args_list()
+                self._on_name_owner_changed(str(name), str(old_owner), str(new_owner))
+            except Exception as e:
+                logging.debug(f"Error handling NameOwnerChanged: {e}")
+        elif interface == 'org.freedesktop.DBus.ObjectManager':
+            member = message.get_member()
+            try:
+                if member == 'InterfacesAdded':
+                    object_path, interfaces = message.get_args_list()
+                    self._on_interfaces_added(object_path, interfaces,
+                                              sender=message.get_sender())
+                elif member == 'InterfacesRemoved':
+                    object_path, interfaces = message.get_args_list()
+                    self._on_interfaces_removed(object_path, interfaces,
+                                                sender=message.get_sender())
+            except Exception as e:
+                logging.debug(f"Error handling {member}: {e}")
+        return dbus.lowlevel.HANDLER_RESULT_NOT_YET_HANDLED
+
     def _on_name_owner_changed(self, name, old_owner, new_owner):
         """
         D-Bus signal handler for service appearing/disappearing.
@@ -1097,13 +1423,37 @@ class BLEAdvertisementRouter:
         if name.startswith(':'):
             return
         
-        # Service appeared - check for registrations (non-blocking single service check)
+        # Service appeared - queue it for a coalesced registration scan
         if new_owner and not old_owner:
-            self._check_service_registrations(name)
-        
+            if name.startswith('com.victronenergy.'):
+                self._service_owners[name] = str(new_owner)
+            self._appeared_services.add(name)
+            if not self._appeared_drain_scheduled:
+                self._appeared_drain_scheduled = True
+                GLib.timeout_add(200, self._drain_appeared_services)
+
         # Service disappeared - remove any cached emitters and registrations
         elif old_owner and not new_owner:
+            self._appeared_services.discard(name)
+            self._service_owners.pop(name, None)
+            self._scan_completed.discard(name)
+            self._pending_introspects.pop(name, None)
+            self._walk_errors.discard(name)
             self._remove_service_registrations(name)
+
+    def _drain_appeared_services(self):
+        """One-shot timer callback - scan every service that appeared recently.
+
+        A boot-time burst of NameOwnerChanged signals collapses into a single
+        pass here; each scan is itself async, so this just starts the
+        GetManagedObjects/introspection calls and returns.
+        """
+        self._appeared_drain_scheduled = False
+        appeared = self._appeared_services
+        self._appeared_services = set()
+        for name in appeared:
+            self._check_service_registrations(name)
+        return False
     
     def _check_service_registrations(self, service_name, timeout: float = 1.0):
         """Check a single service for BLE registration paths using async D-Bus.
@@ -1114,12 +1464,59 @@ class BLEAdvertisementRouter:
         # Only check if this looks like a client service (not system services)
         if not service_name.startswith('com.victronenergy.'):
             return
-        
+
+        # A (re)scan is starting - previous completion and walk state is stale
+        self._scan_completed.discard(service_name)
+        self._pending_introspects.pop(service_name, None)
+        self._walk_errors.discard(service_name)
+
+        try:
+            # Prefer ObjectManager: one round-trip returns the full object
+            # tree, where recursive introspection costs one call per node.
+            # Services without the interface fall back to introspection.
+            logging.debug(f"  Querying {service_name} via GetManagedObjects (async, {timeout}s timeout)...")
+            obj = self.intro_bus.get_object(service_name, '/')
+            obj_manager = dbus.Interface(obj, 'org.freedesktop.DBus.ObjectManager')
+            obj_manager.GetManagedObjects(
+                reply_handler=lambda objects: self._on_managed_objects_reply(service_name, objects),
+                error_handler=lambda e: self._introspect_service(service_name, timeout),
+                timeout=timeout
+            )
+        except Exception as e:
+            logging.debug(f"  - Could not query {service_name}: {e}")
+
+    def _on_managed_objects_reply(self, service_name, objects):
+        """Handle GetManagedObjects reply - register paths with no further D-Bus calls."""
+        try:
+            # The reply is the service's full object listing, so the scan is
+            # complete whether or not anything matched
+            self._scan_completed.add(service_name)
+            found = False
+            for path in objects.keys():
+                path = str(path)
+                if '/ble_advertisements/' in path:
+                    found = self._register_path(service_name, path) or found
+            if found:
+                logging.info(f"  ✓ Service {service_name} registered via GetManagedObjects")
+                self._update_emitters()
+                # Clear device cache when registrations change
+                self.discovered_devices.clear()
+                logging.debug("Cleared device cache (new registration)")
+            else:
+                logging.debug(f"  - Service {service_name} has no ble_advertisements")
+        except Exception as e:
+            logging.debug(f"  - Error processing managed objects for {service_name}: {e}")
+
+    def _introspect_service(self, service_name, timeout: float = 1.0):
+        """Fallback registration scan via recursive introspection.
+
+        Used for services that don't implement org.freedesktop.DBus.ObjectManager.
+        """
         try:
             logging.debug(f"  Introspecting {service_name} (async, {timeout}s timeout)...")
-            obj = self.bus.get_object(service_name, '/')
+            obj = self.intro_bus.get_object(service_name, '/')
             intro = dbus.Interface(obj, 'org.freedesktop.DBus.Introspectable')
-            
+
             # Use async introspection - this won't block the mainloop
             intro.Introspect(
                 reply_handler=lambda xml: self._on_introspect_reply(service_name, xml),
@@ -1136,12 +1533,20 @@ class BLEAdvertisementRouter:
             if 'ble_advertisements' in xml:
                 logging.info(f"  ✓ Service {service_name} has ble_advertisements, parsing...")
                 # Parse just this service's registrations
+                # Each registered leaf clears the device cache as it lands,
+                # so no clear is needed at the root reply - here no leaf has
+                # been registered yet.
                 self._parse_registrations(service_name, '/', xml)
                 self._update_emitters()
-                # Clear device cache when registrations change
-                self.discovered_devices.clear()
-                logging.debug("Cleared device cache (new registration)")
+                # A root with no children to walk completes immediately;
+                # otherwise the last child reply drains the counter and
+                # marks completion in _introspect_call_finished.
+                if (service_name not in self._pending_introspects
+                        and service_name not in self._walk_errors):
+                    self._scan_completed.add(service_name)
             else:
+                # Nothing to walk - this counts as a completed scan
+                self._scan_completed.add(service_name)
                 logging.debug(f"  - Service {service_name} has no ble_advertisements")
         except Exception as e:
             logging.debug(f"  - Error processing introspection for {service_name}: {e}")
@@ -1156,175 +1561,308 @@ class BLEAdvertisementRouter:
     
     def _remove_service_registrations(self, service_name):
         """Remove all registrations and emitters for a service that disappeared"""
-        # Remove from manufacturer registrations
-        for mfg_id, paths in list(self.mfg_registrations.items()):
-            paths_to_remove = {p for p in paths if service_name in p}
-            if paths_to_remove:
-                paths.difference_update(paths_to_remove)
-                if not paths:
-                    del self.mfg_registrations[mfg_id]
-        
-        # Remove from MAC registrations
-        for mac, paths in list(self.mac_registrations.items()):
-            paths_to_remove = {p for p in paths if service_name in p}
-            if paths_to_remove:
-                paths.difference_update(paths_to_remove)
-                if not paths:
-                    del self.mac_registrations[mac]
-        
-        # Remove from product ID registrations
-        for key, paths in list(self.pid_registrations.items()):
-            paths_to_remove = {p for p in paths if service_name in p}
-            if paths_to_remove:
-                paths.difference_update(paths_to_remove)
-                if not paths:
-                    del self.pid_registrations[key]
-        
-        # Remove from product ID range registrations
-        for key, paths in list(self.pid_range_registrations.items()):
-            paths_to_remove = {p for p in paths if service_name in p}
-            if paths_to_remove:
-                paths.difference_update(paths_to_remove)
-                if not paths:
-                    del self.pid_range_registrations[key]
-        
+        paths_to_remove = self._paths_by_service.pop(service_name, None)
+        if not paths_to_remove:
+            return
+
+        # Drop the service's paths from every registration map; set difference
+        # runs at C speed, and empty keys are removed so lookup maps don't
+        # accumulate dead entries
+        for registrations in (self.mfg_registrations, self.mac_registrations,
+                              self.pid_registrations, self.pid_range_registrations):
+            for key, paths in list(registrations.items()):
+                if paths & paths_to_remove:
+                    paths.difference_update(paths_to_remove)
+                    if not paths:
+                        del registrations[key]
+
         # Remove emitters
-        paths_to_remove = [path for path in self.emitters.keys() if service_name in path]
-        if paths_to_remove:
-            logging.info(f"Service {service_name} disappeared, removing {len(paths_to_remove)} registration(s)")
-            for path in paths_to_remove:
+        logging.info(f"Service {service_name} disappeared, removing {len(paths_to_remove)} registration(s)")
+        for path in paths_to_remove:
+            emitter = self.emitters.pop(path, None)
+            if emitter is not None:
                 try:
-                    self.emitters[path].remove_from_connection()
-                    del self.emitters[path]
+                    emitter.remove_from_connection()
                 except:
                     pass
-            # Clear device cache when registrations change
-            self.discovered_devices.clear()
-            logging.debug("Cleared device cache (registration removed)")
+
+        self._rebuild_filter_keys()
+
+        # Clear device cache when registrations change
+        self.discovered_devices.clear()
+        logging.debug("Cleared device cache (registration removed)")
+
+        self._save_registration_cache()
     
     def _update_emitters(self):
         """Create or remove emitters based on registered filters"""
         # Collect all registration paths that should have emitters
         active_paths = set()
-        
+
         for paths in self.mfg_registrations.values():
             active_paths.update(paths)
-        
+
         for paths in self.mac_registrations.values():
             active_paths.update(paths)
-        
+
         for paths in self.pid_registrations.values():
             active_paths.update(paths)
-        
+
         for paths in self.pid_range_registrations.values():
             active_paths.update(paths)
-        
+
+        # Diff against the live emitters with set operations instead of
+        # membership-testing every path. Each registered leaf found during an
+        # async introspection walk re-enters here, so the no-change case has
+        # to be cheap - and when nothing changed the filter keys and the
+        # registration cache are already current too.
+        existing = self.emitters.keys()
+        to_add = active_paths - existing
+        to_remove = existing - active_paths
+        if not to_add and not to_remove:
+            return
+
+        self._rebuild_filter_keys()
+
         logging.info(f"_update_emitters: {len(active_paths)} active paths, {len(self.emitters)} existing emitters")
-        
+
         # Create emitters for new paths
-        for path in active_paths:
-            if path not in self.emitters:
-                try:
-                    self.emitters[path] = AdvertisementEmitter(self.bus_name, path)
-                    logging.info(f"Created emitter for {path}")
-                except Exception as e:
-                    logging.error(f"Failed to create emitter for {path}: {e}", exc_info=True)
-        
+        for path in to_add:
+            try:
+                self.emitters[path] = AdvertisementEmitter(self.bus_name, path)
+                logging.info(f"Created emitter for {path}")
+            except Exception as e:
+                logging.error(f"Failed to create emitter for {path}: {e}", exc_info=True)
+
         # Remove emitters for paths that are no longer registered
-        for path in list(self.emitters.keys()):
-            if path not in active_paths:
-                try:
-                    self.emitters[path].remove_from_connection()
-                    del self.emitters[path]
-                    logging.info(f"Removed emitter for {path} (registration removed)")
-                except Exception as e:
-                    logging.error(f"Failed to remove emitter {path}: {e}")
+        for path in to_remove:
+            try:
+                self.emitters[path].remove_from_connection()
+                del self.emitters[path]
+                logging.info(f"Removed emitter for {path} (registration removed)")
+            except Exception as e:
+                logging.error(f"Failed to remove emitter {path}: {e}")
+
+        self._save_registration_cache()
+
+    def _load_registration_cache(self):
+        """Load the per-service registration cache written by a previous run.
+
+        Returns {service_name: {'owner': str, 'paths': [str]}}; missing or
+        unreadable caches just mean every service gets a live scan.
+        """
+        try:
+            with open(REGISTRATION_CACHE) as f:
+                cache = json.load(f)
+            if isinstance(cache, dict):
+                return cache
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logging.debug(f"Could not load registration cache: {e}")
+        return {}
+
+    def _save_registration_cache(self):
+        """Schedule a debounced write of the registration cache.
+
+        Registration changes arrive in bursts (one async introspect reply per
+        leaf, several services at startup); coalescing through a 500ms timer
+        turns each burst into a single file rewrite.
+        """
+        if self._reg_cache_save_pending:
+            return
+        self._reg_cache_save_pending = True
+        GLib.timeout_add(500, self._write_registration_cache)
+
+    def _write_registration_cache(self):
+        """Persist current registrations keyed by service and bus owner.
+
+        Written atomically (tmpfile + rename) to tmpfs; a restart of this
+        service replays entries whose owner is unchanged instead of
+        re-scanning the peer.
+        """
+        self._reg_cache_save_pending = False
+        try:
+            cache = {}
+            for service_name, owner in self._service_owners.items():
+                # Only completed scans are trustworthy - persisting a pending,
+                # timed-out or partially-walked service would make every later
+                # restart replay an incomplete registration set and skip the
+                # live scan that would have found the rest
+                if service_name not in self._scan_completed:
+                    continue
+                service_paths = sorted(self._paths_by_service.get(service_name, ()))
+                cache[service_name] = {'owner': owner, 'paths': service_paths}
+
+            os.makedirs(os.path.dirname(REGISTRATION_CACHE), exist_ok=True)
+            tmp_path = REGISTRATION_CACHE + '.tmp'
+            with open(tmp_path, 'w') as f:
+                json.dump(cache, f, separators=(',', ':'))
+            os.replace(tmp_path, REGISTRATION_CACHE)
+        except Exception as e:
+            logging.debug(f"Could not save registration cache: {e}")
+        return False  # One-shot timer
     
+    def _register_path(self, service_name: str, path: str) -> bool:
+        """Classify a single object path and record it in the registration maps.
+
+        Registration path patterns (flat, no nesting):
+        - /ble_advertisements/{service}/mfgr/{mfgr_id} - all devices from manufacturer
+        - /ble_advertisements/{service}/mfgr_product/{mfgr_id}_{product_id} - specific product
+        - /ble_advertisements/{service}/mfgr_product_range/{mfgr_id}_{low_pid}_{high_pid} - product range
+        - /ble_advertisements/{service}/addr/{mac} - specific MAC address
+
+        Returns True if the path matched a registration pattern.
+        """
+        # Product range: /mfgr_product_range/{mfgr_id}_{low_pid}_{high_pid}
+        if '/mfgr_product_range/' in path:
+            match = _RE_MFGR_PRODUCT_RANGE.search(path)
+            if match:
+                mfg_id = int(match.group(1))
+                min_pid = int(match.group(2))
+                max_pid = int(match.group(3))
+                key = (mfg_id, min_pid, max_pid)
+                if key not in self.pid_range_registrations:
+                    self.pid_range_registrations[key] = set()
+                self.pid_range_registrations[key].add(path)
+                self._paths_by_service.setdefault(service_name, set()).add(path)
+                logging.info(f"Registered mfgr_product_range {path} from {service_name} (mfg={mfg_id}, pid={min_pid}-{max_pid})")
+                return True
+
+        # Specific product: /mfgr_product/{mfgr_id}_{product_id}
+        elif '/mfgr_product/' in path:
+            match = _RE_MFGR_PRODUCT.search(path)
+            if match:
+                mfg_id = int(match.group(1))
+                pid = int(match.group(2))
+                key = (mfg_id, pid)
+                if key not in self.pid_registrations:
+                    self.pid_registrations[key] = set()
+                self.pid_registrations[key].add(path)
+                self._paths_by_service.setdefault(service_name, set()).add(path)
+                logging.info(f"Registered mfgr_product {path} from {service_name} (mfg={mfg_id}, pid={pid})")
+                return True
+
+        # Manufacturer only: /mfgr/{mfgr_id}
+        elif '/mfgr/' in path:
+            match = _RE_MFGR.search(path)
+            if match:
+                mfg_id = int(match.group(1))
+                if mfg_id not in self.mfg_registrations:
+                    self.mfg_registrations[mfg_id] = set()
+                self.mfg_registrations[mfg_id].add(path)
+                self._paths_by_service.setdefault(service_name, set()).add(path)
+                logging.info(f"Registered mfgr {path} from {service_name} (mfg={mfg_id})")
+                return True
+
+        # MAC address: /addr/{mac}
+        elif '/addr/' in path:
+            # Extract MAC from path
+            # e.g., /ble_advertisements/orion_tr/addr/ef_c1_11_9d_a3_91 or /addr/EFC1119DA391
+            parts = path.split('/addr/')
+            if len(parts) == 2:
+                mac_part = parts[1]
+                # Remove underscores first (some services use them instead of colons)
+                mac_part = mac_part.replace('_', '')
+                # Convert to standard format with colons. A single format
+                # expression instead of a slice list + join keeps this to one
+                # string allocation per registration path.
+                if ':' not in mac_part and len(mac_part) == 12:
+                    mac = (f"{mac_part[0:2]}:{mac_part[2:4]}:{mac_part[4:6]}:"
+                           f"{mac_part[6:8]}:{mac_part[8:10]}:{mac_part[10:12]}")
+                else:
+                    mac = mac_part
+                mac = mac.upper()
+                if mac not in self.mac_registrations:
+                    self.mac_registrations[mac] = set()
+                self.mac_registrations[mac].add(path)
+                self._paths_by_service.setdefault(service_name, set()).add(path)
+                logging.debug(f"Registered {path} from {service_name} (MAC: {mac})")
+                return True
+
+        return False
+
     def _parse_registrations(self, service_name: str, path: str, xml: str):
         """Recursively parse introspection XML to find registration paths"""
-        # Simple XML parsing - look for paths matching our registration pattern
-        import xml.etree.ElementTree as ET
-        
+        # Only the child node names matter here, so scan for them directly
+        # instead of building an ElementTree per introspected path.
         try:
-            root = ET.fromstring(xml)
-            
-            # Registration path patterns (flat, no nesting):
-            # - /ble_advertisements/{service}/mfgr/{mfgr_id} - all devices from manufacturer
-            # - /ble_advertisements/{service}/mfgr_product/{mfgr_id}_{product_id} - specific product
-            # - /ble_advertisements/{service}/mfgr_product_range/{mfgr_id}_{low_pid}_{high_pid} - product range
-            # - /ble_advertisements/{service}/addr/{mac} - specific MAC address
-            
             if '/ble_advertisements/' in path:
-                # Product range: /mfgr_product_range/{mfgr_id}_{low_pid}_{high_pid}
-                if '/mfgr_product_range/' in path:
-                    match = re.search(r'/mfgr_product_range/(\d+)_(\d+)_(\d+)$', path)
-                    if match:
-                        mfg_id = int(match.group(1))
-                        min_pid = int(match.group(2))
-                        max_pid = int(match.group(3))
-                        key = (mfg_id, min_pid, max_pid)
-                        if key not in self.pid_range_registrations:
-                            self.pid_range_registrations[key] = set()
-                        self.pid_range_registrations[key].add(path)
-                        logging.info(f"Registered mfgr_product_range {path} from {service_name} (mfg={mfg_id}, pid={min_pid}-{max_pid})")
-                
-                # Specific product: /mfgr_product/{mfgr_id}_{product_id}
-                elif '/mfgr_product/' in path:
-                    match = re.search(r'/mfgr_product/(\d+)_(\d+)$', path)
-                    if match:
-                        mfg_id = int(match.group(1))
-                        pid = int(match.group(2))
-                        key = (mfg_id, pid)
-                        if key not in self.pid_registrations:
-                            self.pid_registrations[key] = set()
-                        self.pid_registrations[key].add(path)
-                        logging.info(f"Registered mfgr_product {path} from {service_name} (mfg={mfg_id}, pid={pid})")
-                
-                # Manufacturer only: /mfgr/{mfgr_id}
-                elif '/mfgr/' in path:
-                    match = re.search(r'/mfgr/(\d+)$', path)
-                    if match:
-                        mfg_id = int(match.group(1))
-                        if mfg_id not in self.mfg_registrations:
-                            self.mfg_registrations[mfg_id] = set()
-                        self.mfg_registrations[mfg_id].add(path)
-                        logging.info(f"Registered mfgr {path} from {service_name} (mfg={mfg_id})")
-                
-                # MAC address: /addr/{mac}
-                elif '/addr/' in path:
-                    # Extract MAC from path
-                    # e.g., /ble_advertisements/orion_tr/addr/ef_c1_11_9d_a3_91 or /addr/EFC1119DA391
-                    parts = path.split('/addr/')
-                    if len(parts) == 2:
-                        mac_part = parts[1]
-                        # Remove underscores first (some services use them instead of colons)
-                        mac_part = mac_part.replace('_', '')
-                        # Convert to standard format with colons
-                        if ':' not in mac_part and len(mac_part) == 12:
-                            mac = ':'.join([mac_part[i:i+2] for i in range(0, 12, 2)])
-                        else:
-                            mac = mac_part
-                        mac = mac.upper()
-                        if mac not in self.mac_registrations:
-                            self.mac_registrations[mac] = set()
-                        self.mac_registrations[mac].add(path)
-                        logging.debug(f"Registered {path} from {service_name} (MAC: {mac})")
-            
-            # Recursively check child nodes
-            for node in root.findall('node'):
-                child_name = node.get('name')
+                if self._register_path(service_name, path):
+                    # Leaf registrations arrive one async reply at a time, so
+                    # sync the emitters and clear the device cache as each one
+                    # lands rather than once at the end of the walk - a device
+                    # digest-cached between the root reply and its leaf
+                    # arriving would otherwise not be re-announced to the new
+                    # path until its payload changes.
+                    self._update_emitters()
+                    self.discovered_devices.clear()
+                    logging.debug("Cleared device cache (new registration)")
+
+            # Recursively check child nodes (async - replies re-enter
+            # _parse_registrations for the child path without blocking the
+            # main loop while slow services respond). Registrations only ever
+            # live under /ble_advertisements, so prune every other subtree
+            # instead of introspecting it - on services with large unrelated
+            # object trees this cuts the walk by orders of magnitude. Every
+            # scheduled child is counted so walk completion can be detected
+            # when the last reply or error drains the counter.
+            for m in _RE_NODE_NAME.finditer(xml):
+                child_name = m.group(2)
                 if child_name:
                     child_path = f"{path}/{child_name}".replace('//', '/')
+                    if not (child_path == '/ble_advertisements'
+                            or child_path.startswith('/ble_advertisements/')):
+                        continue
                     try:
-                        obj = self.bus.get_object(service_name, child_path)
+                        obj = self.intro_bus.get_object(service_name, child_path)
                         intro = dbus.Interface(obj, 'org.freedesktop.DBus.Introspectable')
-                        child_xml = intro.Introspect()
-                        self._parse_registrations(service_name, child_path, child_xml)
-                    except:
-                        pass
-        
+                        self._pending_introspects[service_name] = \
+                            self._pending_introspects.get(service_name, 0) + 1
+                        intro.Introspect(
+                            reply_handler=lambda xml, p=child_path: self._on_child_introspect_reply(service_name, p, xml),
+                            error_handler=lambda e, p=child_path: self._on_child_introspect_error(service_name, p, e),
+                            timeout=1.0
+                        )
+                    except Exception as e:
+                        logging.debug(f"Could not introspect {service_name}{child_path}: {e}")
+                        self._walk_errors.add(service_name)
+
         except Exception as e:
             logging.debug(f"Error parsing XML for {service_name}{path}: {e}")
+            self._walk_errors.add(service_name)
+
+    def _on_child_introspect_reply(self, service_name, path, xml):
+        """Child Introspect reply - parse it, then account for its completion."""
+        try:
+            self._parse_registrations(service_name, path, xml)
+        finally:
+            self._introspect_call_finished(service_name)
+
+    def _on_child_introspect_error(self, service_name, path, error):
+        """Child Introspect error/timeout - the walk is no longer complete."""
+        logging.debug(f"Introspect failed for {service_name}{path}: {error}")
+        self._walk_errors.add(service_name)
+        self._introspect_call_finished(service_name)
+
+    def _introspect_call_finished(self, service_name):
+        """Account for one finished child Introspect of a recursive walk.
+
+        Parsing a reply schedules its own children before this decrement
+        runs, so the counter only drains to zero when the whole subtree has
+        answered. A walk that drained without any error or abandoned subtree
+        is complete, and only then may the registration cache persist this
+        service - anything less would be replayed after a restart as if it
+        were the full registration set.
+        """
+        remaining = self._pending_introspects.get(service_name, 1) - 1
+        if remaining > 0:
+            self._pending_introspects[service_name] = remaining
+            return
+        self._pending_introspects.pop(service_name, None)
+        if service_name not in self._walk_errors:
+            self._scan_completed.add(service_name)
+            self._save_registration_cache()
     
     def _extract_product_id(self, data: bytes) -> Optional[int]:
         """Extract product ID from Victron BLE advertisement data.
@@ -1349,47 +1887,65 @@ class BLEAdvertisementRouter:
         - Anyone registered for this specific (mfg_id, product_id) combo, OR
         - Anyone registered for a (mfg_id, min, max) range that includes product_id
         """
-        # Check MAC registrations first (most specific)
+        # Check MAC registrations first (most specific); everything keyed on
+        # the payload comes from the memoized route cache, so repeat
+        # (mfg, pid) pairs cost one dict lookup instead of a range scan
         if mac in self.mac_registrations:
             return True
-        
-        # Check product ID registrations (if we have a product ID)
-        if product_id is not None:
-            # Check specific product ID registrations
-            if (mfg_id, product_id) in self.pid_registrations:
-                return True
-            
-            # Check product ID range registrations
-            for (reg_mfg, min_pid, max_pid), paths in self.pid_range_registrations.items():
-                if reg_mfg == mfg_id and min_pid <= product_id <= max_pid:
-                    return True
-        
-        # Check manufacturer-only registrations (least specific)
-        if mfg_id in self.mfg_registrations:
-            return True
-        
-        return False
+        return bool(self._routes_for(mfg_id, product_id))
+
+    def _routes_for(self, mfg_id: int, product_id: Optional[int]) -> frozenset:
+        """Registration paths matching a payload's (mfg_id, product_id) pair.
+
+        Memoized per pair - only the first advertisement after a registration
+        change pays for the pid-range scan. MAC-keyed registrations are
+        excluded; they don't depend on the payload.
+        """
+        route_key = (mfg_id, product_id)
+        routed = self._route_cache.get(route_key)
+        if routed is None:
+            paths = set()
+
+            # Paths registered for this manufacturer ID (no product filter)
+            if mfg_id in self.mfg_registrations:
+                paths.update(self.mfg_registrations[mfg_id])
+
+            if product_id is not None:
+                # Paths registered for the specific product ID
+                if route_key in self.pid_registrations:
+                    paths.update(self.pid_registrations[route_key])
+
+                # Paths registered for product ID ranges
+                for (reg_mfg, min_pid, max_pid), range_paths in self.pid_range_registrations.items():
+                    if reg_mfg == mfg_id and min_pid <= product_id <= max_pid:
+                        paths.update(range_paths)
+
+            # Cap-and-clear: the key space is payload-controlled, so a
+            # spoofed mfg id cycling product bytes must not grow the cache
+            # unboundedly. Legitimate keys are few and rebuild cheaply.
+            if len(self._route_cache) >= ROUTE_CACHE_MAX:
+                self._route_cache.clear()
+            routed = self._route_cache[route_key] = frozenset(paths)
+        return routed
     
+    def _rebuild_filter_keys(self):
+        """Rebuild the frozenset snapshots backing should_process_advertisement.
+
+        Collects every manufacturer ID with any kind of registration (plain,
+        product ID, or product ID range) so the hot-path check never has to
+        scan the product registration keys linearly.
+        """
+        mfg_ids = set(self.mfg_registrations)
+        mfg_ids.update(mfg for (mfg, _pid) in self.pid_registrations)
+        mfg_ids.update(mfg for (mfg, _lo, _hi) in self.pid_range_registrations)
+        self._mfg_keys = frozenset(mfg_ids)
+        self._mac_keys = frozenset(self.mac_registrations)
+        # Any registration change invalidates the memoized (mfg, pid) routes
+        self._route_cache.clear()
+
     def should_process_advertisement(self, mac: str, mfg_id: int) -> bool:
         """Check if this advertisement matches our filters (basic check without product ID)"""
-        # Check if anyone registered for this manufacturer ID
-        if mfg_id in self.mfg_registrations:
-            return True
-        
-        # Check if anyone registered for this specific MAC
-        if mac in self.mac_registrations:
-            return True
-        
-        # Check if there are any product ID or range registrations for this manufacturer
-        for (reg_mfg, pid) in self.pid_registrations.keys():
-            if reg_mfg == mfg_id:
-                return True
-        
-        for (reg_mfg, min_pid, max_pid) in self.pid_range_registrations.keys():
-            if reg_mfg == mfg_id:
-                return True
-        
-        return False
+        return mfg_id in self._mfg_keys or mac in self._mac_keys
     
     @dbus.service.signal(dbus_interface='com.victronenergy.switch.ble_advertisements',
                          signature='sqayn')
@@ -1451,7 +2007,7 @@ class BLEAdvertisementRouter:
                 mfg_data = props.get('ManufacturerData', {})
                 adapter = path.split('/')[3] if len(path.split('/')) > 3 else 'hci0'
                 if name:
-                    self.device_names[mac] = name
+                    self._set_device_name(mac, name)
                 for mfg_id_var, data_var in mfg_data.items():
                     mfg_id = int(mfg_id_var)
                     data = bytes(data_var)
@@ -1512,83 +2068,122 @@ class BLEAdvertisementRouter:
         rssi = adv_data.rssi or 0
         name = adv_data.local_name or ""
 
-        if name:
-            self.device_names[mac] = name
-
         mfg_data_dict = adv_data.manufacturer_data or {}
         if mfg_data_dict:
             for mfg_id, mfg_data in mfg_data_dict.items():
-                logging.debug(f"Passive scan: {mac} name='{name}' mfg={mfg_id:#06x} len={len(mfg_data)} rssi={rssi} via {adapter}")
-                GLib.idle_add(
-                    self._process_scanned_advertisement,
-                    mac, mfg_id, bytes(mfg_data), rssi, adapter, name
-                )
+                logging.debug("Passive scan: %s name='%s' mfg=%#06x len=%d rssi=%d via %s",
+                              mac, name, mfg_id, len(mfg_data), rssi, adapter)
+                self._adv_queue.append((mac, mfg_id, bytes(mfg_data), rssi, adapter, name))
+        elif name:
+            # Name-only advertisement (e.g. scan response without mfg data):
+            # queue it so the name cache is still mutated on the main loop only
+            self._adv_queue.append((mac, None, b'', rssi, adapter, name))
         else:
-            logging.debug(f"Passive scan (no mfg data): {mac} name='{name}' rssi={rssi} via {adapter}")
-
-    def _process_scanned_advertisement(self, mac, mfg_id, data, rssi, interface, name):
-        """GLib idle callback - bridges from scanner thread to main thread"""
-        if name and self.device_names.get(mac) != name:
-            self.device_names[mac] = name
-            self._update_device_name_if_exists(mac, name)
-        self.process_advertisement(mac, mfg_id, data, rssi, interface)
+            logging.debug("Passive scan (no mfg data): %s name='%s' rssi=%d via %s",
+                          mac, name, rssi, adapter)
+            return
+
+        # Schedule a single drain callback for the whole queue. The flag
+        # is only a hint (deque operations are thread-safe on their own);
+        # a spurious extra idle_add just drains an empty queue once.
+        if not self._adv_drain_scheduled:
+            self._adv_drain_scheduled = True
+            GLib.idle_add(self._drain_advertisements)
+
+    def _drain_advertisements(self):
+        """GLib idle callback - drains queued advertisements in batches.
+
+        Processes up to 256 advertisements per invocation so a burst doesn't
+        starve other main loop sources; reschedules itself while the queue
+        still has entries. The timestamp is taken once per batch - sub-batch
+        timing differences are meaningless against the repeat/log intervals
+        measured in minutes.
+        """
+        now = time.time()
+        # Advertisement flow doubles as the liveness heartbeat: GetStatus
+        # reports stale only when nothing has come off the scanner for 30
+        # minutes, which also catches a dead scanner thread - something a
+        # periodic timer could never notice.
+        self.root_obj.heartbeat = now
+        for _ in range(256):
+            try:
+                mac, mfg_id, data, rssi, interface, name = self._adv_queue.popleft()
+            except IndexError:
+                self._adv_drain_scheduled = False
+                return False
+            if name and self.device_names.get(mac) != name:
+                self._set_device_name(mac, name)
+                self._update_device_name_if_exists(mac, name)
+            if mfg_id is None:
+                continue  # Name-only entry, nothing to route
+            self.process_advertisement(mac, mfg_id, data, rssi, interface, now)
+        if self._adv_queue:
+            return True  # More queued - run again on the next idle cycle
+        self._adv_drain_scheduled = False
         return False
 
-    def process_advertisement(self, mac: str, mfg_id: int, data: bytes, rssi: int, interface: str):
-        """Process a complete BLE advertisement"""
+    def process_advertisement(self, mac: str, mfg_id: int, data: bytes, rssi: int, interface: str,
+                              now: Optional[float] = None):
+        """Process a complete BLE advertisement
+
+        now is the batch timestamp from _drain_advertisements; callers outside
+        the drain loop may omit it.
+        """
         if not self.should_process_advertisement(mac, mfg_id):
             return
-        
-        product_id = self._extract_product_id(data)
-        
-        has_registration = self._has_registration_for_advertisement(mac, mfg_id, product_id)
-        if not has_registration:
-            return
-        
-        # Step 2: Check if device is in our cache (fast path)
-        relay_id = mac.replace(':', '').lower()  # e.g., "efc1119da391"
-        now = time.time()
-        
-        if relay_id in self.discovered_devices:
-            cache_entry = self.discovered_devices[relay_id]
-            
+
+        relay_id = _mac_to_relay_id(mac)  # e.g., "efc1119da391"
+        if now is None:
+            now = time.time()
+
+        # Steady-state fast path: a cache hit means the full registration
+        # check passed when this device was discovered, and the cache is
+        # cleared on every registration change - so a known device goes
+        # straight to dedup and emit without re-deriving the product id or
+        # re-walking the registration maps per packet.
+        cache_entry = self.discovered_devices.get(relay_id)
+        if cache_entry is not None:
+            self.discovered_devices.move_to_end(relay_id)
+
             if not cache_entry['route']:
                 return
-            
+
+            digest = _payload_digest(data)
             if self._repeat_interval > 0:
                 previous = cache_entry.get('previous')
                 last_time = cache_entry.get('timestamp', 0.0)
-                
-                if previous == data and (now - last_time) < self._repeat_interval:
+
+                if previous == digest and (now - last_time) < self._repeat_interval:
                     return
-            
-            cache_entry['previous'] = data
+
+            cache_entry['previous'] = digest
             cache_entry['timestamp'] = now
-            self._emit_advertisement(mac, mfg_id, data, rssi, interface)
+            self._emit_advertisement(mac, mfg_id, data, rssi, interface, now)
             return
-        
-        # Step 3: Not in cache - check if there's a registration
-        if not has_registration:
+
+        # Not in cache - run the full registration check once
+        product_id = self._extract_product_id(data)
+
+        if not self._has_registration_for_advertisement(mac, mfg_id, product_id):
             return  # No one cares about this advertisement
-        
+
         # Device has a registration but is not in cache
         # Check if there's an existing D-Bus switch for this device (from previous session)
         output_path = f'/SwitchableOutput/relay_{relay_id}'
         if f'{output_path}/State' in self.dbusservice:
             # Switch exists on D-Bus - restore to cache and route if enabled
             state = self.dbusservice[f'{output_path}/State']
-            self.discovered_devices[relay_id] = {
+            self._cache_device(relay_id, {
                 'route': (state == 1),
-                'previous': data,
+                'previous': _payload_digest(data),
                 'timestamp': now,
                 'last_log_time': 0.0
-            }
+            })
             if state == 1:
-                self._emit_advertisement(mac, mfg_id, data, rssi, interface)
+                self._emit_advertisement(mac, mfg_id, data, rssi, interface, now)
             return
         
-        discovery_enabled = self.dbusservice['/SwitchableOutput/relay_discovery/State'] == 1
-        if discovery_enabled:
+        if self._discovery_enabled:
             # Create an enabled switch for this MAC
             device_name = self.device_names.get(mac, "")
             
@@ -1602,82 +2197,75 @@ class BLEAdvertisementRouter:
             
             # Update cache with this payload
             if relay_id in self.discovered_devices:
-                self.discovered_devices[relay_id]['previous'] = data
+                self.discovered_devices[relay_id]['previous'] = _payload_digest(data)
                 self.discovered_devices[relay_id]['timestamp'] = now
             
             # Route the advertisement
-            self._emit_advertisement(mac, mfg_id, data, rssi, interface)
+            self._emit_advertisement(mac, mfg_id, data, rssi, interface, now)
         # else: discovery disabled and no existing switch -> don't create new switch
     
-    def _emit_advertisement(self, mac: str, mfg_id: int, data: bytes, rssi: int, interface: str):
-        """Emit D-Bus signals for an advertisement to all matching registration paths"""
+    def _emit_advertisement(self, mac: str, mfg_id: int, data: bytes, rssi: int, interface: str,
+                            now: Optional[float] = None):
+        """Queue D-Bus signals for an advertisement on all matching registration paths
+
+        Signals are not emitted synchronously; they are coalesced per path and
+        flushed by _flush_emits on a 200ms timer to reduce dbus-daemon traffic.
+        """
         try:
-            # Get device name from cache (or empty string if unknown)
-            device_name = self.device_names.get(mac, "")
-            
             # Extract product ID for filtering
             product_id = self._extract_product_id(data)
-            
-            # Convert data to dbus types
-            data_array = dbus.Array(data, signature='y')
-            mac_dbus = dbus.String(mac)
-            mfg_id_dbus = dbus.UInt16(mfg_id)
-            rssi_dbus = dbus.Int16(rssi)
-            interface_dbus = dbus.String(interface)
-            name_dbus = dbus.String(device_name)
-            
-            emitted_count = 0
-            
-            # Emit on all paths registered for this manufacturer ID (no product filter)
-            if mfg_id in self.mfg_registrations:
-                for path in self.mfg_registrations[mfg_id]:
-                    if path in self.emitters:
-                        self.emitters[path].Advertisement(mac_dbus, mfg_id_dbus, data_array, rssi_dbus, interface_dbus, name_dbus)
-                        emitted_count += 1
-            
-            # Emit on paths registered for specific product ID
-            if product_id is not None:
-                key = (mfg_id, product_id)
-                if key in self.pid_registrations:
-                    for path in self.pid_registrations[key]:
-                        if path in self.emitters:
-                            self.emitters[path].Advertisement(mac_dbus, mfg_id_dbus, data_array, rssi_dbus, interface_dbus, name_dbus)
-                            emitted_count += 1
-                
-                # Emit on paths registered for product ID ranges
-                for (reg_mfg, min_pid, max_pid), paths in self.pid_range_registrations.items():
-                    if reg_mfg == mfg_id and min_pid <= product_id <= max_pid:
-                        for path in paths:
-                            if path in self.emitters:
-                                self.emitters[path].Advertisement(mac_dbus, mfg_id_dbus, data_array, rssi_dbus, interface_dbus, name_dbus)
-                                emitted_count += 1
-            
-            # Emit on all paths registered for this specific MAC
-            if mac in self.mac_registrations:
-                for path in self.mac_registrations[mac]:
-                    if path in self.emitters:
-                        self.emitters[path].Advertisement(mac_dbus, mfg_id_dbus, data_array, rssi_dbus, interface_dbus, name_dbus)
-                        emitted_count += 1
-                    else:
-                        if not hasattr(self, '_missing_emitter_logged'):
-                            self._missing_emitter_logged = set()
-                        if path not in self._missing_emitter_logged:
-                            self._missing_emitter_logged.add(path)
-                            logging.warning(f"No emitter for registered path: {path}")
+
+            # Payload-keyed routes come from the memoized cache
+            routed = self._routes_for(mfg_id, product_id)
+
+            # Paths registered for this specific MAC
+            mac_paths = self.mac_registrations.get(mac)
+            if mac_paths:
+                target_paths = routed | mac_paths
+            else:
+                target_paths = routed
+
+            # Nothing matched - skip the dbus wrapper construction entirely
+            if not target_paths:
+                return
+
+            # Get device name from cache (or empty string if unknown)
+            device_name = self.device_names.get(mac, "")
+
+            # Pass plain Python values - dbus-python coerces them against the
+            # signal's declared signature ('sqaynss') during marshalling, so
+            # pre-wrapping in dbus.String/UInt16/Int16 was pure allocation
+            # overhead. Only the payload keeps an explicit ByteArray: it
+            # marshals as 'ay' without boxing every byte the way
+            # dbus.Array(data, signature='y') would.
+            payload = (
+                mac,
+                mfg_id,
+                dbus.ByteArray(data),
+                rssi,
+                interface,
+                device_name,
+            )
+
+            # Queue without consulting self.emitters - emitters are created 1:1
+            # with registrations by _update_emitters, so the membership check
+            # here was a second dict lookup per path per packet. _flush_emits
+            # resolves the emitter once per flush interval instead and warns
+            # about any registered path that still has none.
+            emitted_count = len(target_paths)
+            for path in target_paths:
+                self._pending_emits.setdefault(path, {})[mac] = payload
             
             # Log routing activity - throttled per device based on log interval slider
             # If log interval is 0, log every routed packet
             # If logging is disabled (_log_enabled=False), skip all routing logs
             if emitted_count > 0 and self._log_enabled:
-                name_str = f" name='{device_name}'" if device_name else ""
-                pid_str = f" pid={product_id:#06x}" if product_id is not None else ""
-                log_msg = f"Routed: {mac}{name_str} mfg={mfg_id:#06x}{pid_str} len={len(data)} → {emitted_count} path(s)"
-                
                 # Check if we should log at INFO level (throttled per device)
-                relay_id = mac.replace(':', '').lower()
-                now = time.time()
+                relay_id = _mac_to_relay_id(mac)
+                if now is None:
+                    now = time.time()
                 should_log_info = False
-                
+
                 if self._log_interval == 0:
                     # Log every packet when interval is 0
                     should_log_info = True
@@ -1687,14 +2275,55 @@ class BLEAdvertisementRouter:
                     if (now - last_log) >= self._log_interval:
                         should_log_info = True
                         cache_entry['last_log_time'] = now
-                
-                if should_log_info:
-                    logging.info(log_msg)
-                else:
-                    logging.debug(log_msg)
+
+                # Build the message only if it will actually be recorded -
+                # at the default INFO level the throttled-out case costs
+                # nothing per packet
+                if should_log_info or _ROOT_LOGGER.isEnabledFor(logging.DEBUG):
+                    name_str = f" name='{device_name}'" if device_name else ""
+                    pid_str = f" pid={product_id:#06x}" if product_id is not None else ""
+                    log_msg = f"Routed: {mac}{name_str} mfg={mfg_id:#06x}{pid_str} len={len(data)} → {emitted_count} path(s)"
+                    if should_log_info:
+                        logging.info(log_msg)
+                    else:
+                        logging.debug(log_msg)
         except Exception as e:
             logging.error(f"Failed to emit signal for {mac}: {e}")
-    
+
+    def _flush_emits(self):
+        """Periodic callback - emit all coalesced advertisement signals.
+
+        A path with a single queued device emits the normal Advertisement
+        signal; multiple devices on the same path fuse into one plural
+        Advertisements message, so each path costs at most one dbus-daemon
+        round-trip per flush interval.
+        """
+        if not self._pending_emits:
+            return True  # Keep the timer running
+
+        pending = self._pending_emits
+        self._pending_emits = {}
+
+        for path, per_mac in pending.items():
+            emitter = self.emitters.get(path)
+            if emitter is None:
+                # Registration disappeared between queue and flush, or the
+                # emitter was never created - warn once per path for the latter
+                if path not in self._missing_emitter_logged:
+                    self._missing_emitter_logged.add(path)
+                    logging.warning(f"No emitter for registered path: {path}")
+                continue
+            try:
+                payloads = list(per_mac.values())
+                if len(payloads) == 1:
+                    emitter.Advertisement(*payloads[0])
+                else:
+                    emitter.Advertisements(payloads)
+            except Exception as e:
+                logging.error(f"Failed to emit signal on {path}: {e}")
+
+        return True  # Keep the timer running
+
     def cleanup(self, signum=None, frame=None):
         """Cleanup on exit"""
         logging.info("Shutting down...")
@@ -1703,6 +2332,11 @@ class BLEAdvertisementRouter:
         if self._scanner_thread and self._scanner_thread.is_alive():
             self._scanner_thread.join(timeout=5)
 
+        try:
+            self.intro_bus.close()
+        except Exception:
+            pass
+
         sys.exit(0)
     
     def run(self):